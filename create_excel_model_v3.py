@@ -1,225 +1,244 @@
-import pandas as pd
-import numpy as np
-from xlsxwriter.utility import xl_rowcol_to_cell
-
-def create_excel_model():
+import functools
+import hashlib
+import os
+import tempfile
+import xlsxwriter
+from xlsxwriter.utility import xl_rowcol_to_cell, xl_range
+
+MODEL_PATH = 'modele_bilan_social_v3.xlsx'
+
+# Résultat en cache des ratios sur le modèle vide (toutes les saisies à 0 : division par zéro),
+# identique à ce qu'affiche Excel après recalcul ; la somme des pourcentages d'âge et les
+# indicateurs calculés à partir de ces ratios donnent aussi #DIV/0!, seule la somme des effectifs vaut 0
+_RATIO_VIDE = '#DIV/0!'
+
+# Feuille Calculs automatiques : formules de la colonne Valeur, dans l'ordre des indicateurs
+# (noms de feuilles contenant des espaces entre apostrophes, comme l'exige Excel)
+_CALCULS_FORMULAS = (
+    "='Données générales'!B4/'Données générales'!B3",
+    "=Rémunérations!C2/Rémunérations!B2",
+    "='Données générales'!B6/'Données générales'!B3",
+    "=AVERAGE(Rémunérations!D2:D6)",
+    "=1-MAX(ABS('Répartition par âge'!C2:C7-0.167))",
+    "='Formation et Recrutement'!B4/('Formation et Recrutement'!B4+'Formation et Recrutement'!B5)",
+    "='Formation et Recrutement'!B6/('Données générales'!B3*1600)",
+    "='Formation et Recrutement'!B7/('Formation et Recrutement'!B7+'Formation et Recrutement'!B8)",
+    "='Formation et Recrutement'!B9/'Données générales'!B3",
+    "='Formation et Recrutement'!B10/'Données générales'!B3",
+    "='Formation et Recrutement'!B11/'Formation et Recrutement'!B12"
+)
+
+# (indicateur, objectif, seuil légal, explication)
+_CALCULS_ROWS = (
+    ('Taux de féminisation', '40%', '-', 'Nombre de femmes / Effectif total'),
+    ('Taux de femmes cadres', '40%', '-', 'Nombre de femmes cadres / Nombre total de cadres'),
+    ('Taux de handicap', '6%', '6%', 'Nombre de personnes en situation de handicap / Effectif total'),
+    ('Écart salarial moyen', '<5%', '-', 'Moyenne des écarts salariaux par catégorie'),
+    ('Score diversité des âges', '>70%', '-', 'Mesure de la diversité des âges (1 - écart max à la répartition idéale)'),
+    ('Taux de CDI', '>80%', '-', 'Nombre de CDI / (Nombre de CDI + Nombre de CDD)'),
+    ('Taux de formation', '>5%', '-', 'Nombre d\'heures de formation / (Effectif total * 1600)'),
+    ('Taux de recrutement interne', '>30%', '-', 'Nombre de recrutements internes / Nombre total de recrutements'),
+    ('Taux de temps partiel', '<20%', '-', 'Nombre d\'employés en temps partiel / Effectif total'),
+    ('Taux de télétravail', '>20%', '-', 'Nombre d\'employés en télétravail / Effectif total'),
+    ('Taux de promotion des femmes', '>40%', '-', 'Nombre de promotions femmes / Nombre total de promotions')
+)
+
+def _signature():
+    # Empreinte du générateur : toute modification des textes, formules ou formats invalide le modèle
+    with open(__file__, 'rb') as f:
+        return hashlib.blake2b(f.read()).hexdigest()
+
+def _format_factory(workbook):
+    # Un seul objet Format par combinaison de propriétés et par classeur
+    @functools.lru_cache(maxsize=None)
+    def add_format(**properties):
+        return workbook.add_format(properties)
+    return add_format
+
+def _build_model(output):
     # Création du fichier Excel
-    writer = pd.ExcelWriter('modele_bilan_social_v3.xlsx', engine='xlsxwriter')
-    workbook = writer.book
+    # En mode constant_memory, chaque ligne est écrite sur disque dès que la suivante commence :
+    # largeurs de colonnes et validations sont posées avant les données, écrites dans l'ordre des lignes.
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
 
     # Définition des styles
-    header_format = workbook.add_format({
-        'bold': True,
-        'text_wrap': True,
-        'valign': 'top',
-        'fg_color': '#4472C4',
-        'font_color': 'white',
-        'border': 1
-    })
-
-    instruction_format = workbook.add_format({
-        'text_wrap': True,
-        'valign': 'top',
-        'border': 1
-    })
-
-    percent_format = workbook.add_format({
-        'num_format': '0.00%',
-        'border': 1
-    })
-
-    number_format = workbook.add_format({
-        'num_format': '#,##0',
-        'border': 1
-    })
-
-    currency_format = workbook.add_format({
-        'num_format': '#,##0.00 €',
-        'border': 1
-    })
+    add_format = _format_factory(workbook)
+    header_format = add_format(bold=True, text_wrap=True, valign='top', fg_color='#4472C4', font_color='white', border=1)
+    instruction_format = add_format(text_wrap=True, valign='top', border=1)
+    percent_format = add_format(num_format='0.00%', border=1)
+    number_format = add_format(num_format='#,##0', border=1)
+    currency_format = add_format(num_format='#,##0.00 €', border=1)
 
     # Feuille Instructions
     instructions = [
-        ['Instructions pour le remplissage du modèle'],
-        [''],
-        ['1. Informations générales'],
-        ['   - Remplissez le nom de l\'entreprise et l\'année d\'évaluation'],
-        ['   - Saisissez le nombre total d\'effectifs et la répartition par genre'],
-        ['   - Indiquez le nombre de personnes en situation de handicap'],
-        [''],
-        ['2. Répartition par âge'],
-        ['   - Saisissez le nombre d\'employés par tranche d\'âge'],
-        ['   - Les totaux et pourcentages sont calculés automatiquement'],
-        [''],
-        ['3. Rémunérations'],
-        ['   - Indiquez les rémunérations moyennes par genre et catégorie'],
-        ['   - Les écarts salariaux sont calculés automatiquement'],
-        [''],
-        ['4. Formation et Recrutement'],
-        ['   - Saisissez les données sur la formation et le recrutement'],
-        ['   - Les taux sont calculés automatiquement'],
-        [''],
-        ['5. Calculs automatiques'],
-        ['   - Cette feuille est protégée et contient les calculs automatiques'],
-        ['   - Ne modifiez pas les formules'],
-        [''],
-        ['Notes importantes :'],
-        ['- Tous les champs numériques doivent être positifs'],
-        ['- Les pourcentages sont exprimés en décimal (ex: 0.4 pour 40%)'],
-        ['- Les montants sont en euros'],
-        ['- Les dates sont au format JJ/MM/AAAA']
+        'Instructions pour le remplissage du modèle',
+        '',
+        '1. Informations générales',
+        '   - Remplissez le nom de l\'entreprise et l\'année d\'évaluation',
+        '   - Saisissez le nombre total d\'effectifs et la répartition par genre',
+        '   - Indiquez le nombre de personnes en situation de handicap',
+        '',
+        '2. Répartition par âge',
+        '   - Saisissez le nombre d\'employés par tranche d\'âge',
+        '   - Les totaux et pourcentages sont calculés automatiquement',
+        '',
+        '3. Rémunérations',
+        '   - Indiquez les rémunérations moyennes par genre et catégorie',
+        '   - Les écarts salariaux sont calculés automatiquement',
+        '',
+        '4. Formation et Recrutement',
+        '   - Saisissez les données sur la formation et le recrutement',
+        '   - Les taux sont calculés automatiquement',
+        '',
+        '5. Calculs automatiques',
+        '   - Cette feuille est protégée et contient les calculs automatiques',
+        '   - Ne modifiez pas les formules',
+        '',
+        'Notes importantes :',
+        '- Tous les champs numériques doivent être positifs',
+        '- Les pourcentages sont exprimés en décimal (ex: 0.4 pour 40%)',
+        '- Les montants sont en euros',
+        '- Les dates sont au format JJ/MM/AAAA'
     ]
 
-    df_instructions = pd.DataFrame(instructions)
-    df_instructions.to_excel(writer, sheet_name='Instructions', index=False, header=False)
-    worksheet = writer.sheets['Instructions']
+    worksheet = workbook.add_worksheet('Instructions')
     worksheet.set_column('A:A', 80)
-    for row_num, row in enumerate(instructions):
-        worksheet.write(row_num, 0, row[0], instruction_format)
+    worksheet.write_column(0, 0, instructions, instruction_format)
 
     # Feuille Données générales
-    general_data = {
-        'Informations': ['Nom de l\'entreprise', 'Année d\'évaluation', 'Effectif total', 'Nombre de femmes', 'Nombre d\'hommes', 'Nombre de personnes en situation de handicap'],
-        'Valeur': ['', '', 0, 0, 0, 0]
-    }
-    df_general = pd.DataFrame(general_data)
-    df_general.to_excel(writer, sheet_name='Données générales', index=False)
-    worksheet = writer.sheets['Données générales']
+    # (information, valeur par défaut)
+    general_rows = [
+        ('Nom de l\'entreprise', ''),
+        ('Année d\'évaluation', ''),
+        ('Effectif total', 0),
+        ('Nombre de femmes', 0),
+        ('Nombre d\'hommes', 0),
+        ('Nombre de personnes en situation de handicap', 0)
+    ]
+    worksheet = workbook.add_worksheet('Données générales')
     worksheet.set_column('A:A', 30)
     worksheet.set_column('B:B', 20)
     
     # Validation des données numériques
-    for row in range(3, 6):
-        worksheet.data_validation(f'B{row+1}', {'validate': 'decimal', 'criteria': '>=', 'value': 0})
+    worksheet.data_validation('B4:B6', {'validate': 'decimal', 'criteria': '>=', 'value': 0})
+    
+    worksheet.write_row(0, 0, ('Informations', 'Valeur'), header_format)
+    for row, (info, val) in enumerate(general_rows, start=1):
+        worksheet.write_string(row, 0, info)
+        if val != '':
+            worksheet.write_number(row, 1, val, number_format)
 
     # Feuille Répartition par âge
-    age_data = {
-        'Tranche d\'âge': ['< 25 ans', '25-34 ans', '35-44 ans', '45-54 ans', '55-64 ans', '> 64 ans', 'Total'],
-        'Effectif': [0, 0, 0, 0, 0, 0, '=SUM(B2:B7)'],
-        'Pourcentage': ['=B2/$B$8', '=B3/$B$8', '=B4/$B$8', '=B5/$B$8', '=B6/$B$8', '=B7/$B$8', '=SUM(C2:C7)']
-    }
-    df_age = pd.DataFrame(age_data)
-    df_age.to_excel(writer, sheet_name='Répartition par âge', index=False)
-    worksheet = writer.sheets['Répartition par âge']
-    worksheet.set_column('A:A', 15)
-    worksheet.set_column('B:C', 15)
+    tranches_age = ['< 25 ans', '25-34 ans', '35-44 ans', '45-54 ans', '55-64 ans', '> 64 ans']
+    worksheet = workbook.add_worksheet('Répartition par âge')
+    worksheet.set_column('A:C', 15)
+    worksheet.write_row(0, 0, ('Tranche d\'âge', 'Effectif', 'Pourcentage'), header_format)
     
-    # Format des pourcentages
-    for row in range(1, 8):
-        worksheet.write(f'C{row+1}', None, percent_format)
+    # Effectifs au format nombre, pourcentages (effectif / total) au format pourcentage
+    total_row = len(tranches_age) + 1
+    total_cell = xl_rowcol_to_cell(total_row, 1, row_abs=True, col_abs=True)
+    for row, tranche in enumerate(tranches_age, start=1):
+        worksheet.write_string(row, 0, tranche)
+        worksheet.write_number(row, 1, 0, number_format)
+        worksheet.write_formula(row, 2, f'={xl_rowcol_to_cell(row, 1)}/{total_cell}', percent_format, _RATIO_VIDE)
+    worksheet.write_string(total_row, 0, 'Total')
+    worksheet.write_formula(total_row, 1, f'=SUM({xl_range(1, 1, total_row - 1, 1)})', number_format, 0)
+    worksheet.write_formula(total_row, 2, f'=SUM({xl_range(1, 2, total_row - 1, 2)})', percent_format, _RATIO_VIDE)
 
     # Feuille Rémunérations
-    remuneration_data = {
-        'Catégorie': ['Cadres', 'Ingénieurs', 'Techniciens', 'Administratifs', 'Ouvriers'],
-        'Rémunération moyenne hommes': [0, 0, 0, 0, 0],
-        'Rémunération moyenne femmes': [0, 0, 0, 0, 0],
-        'Écart salarial': ['=(B2-C2)/B2', '=(B3-C3)/B3', '=(B4-C4)/B4', '=(B5-C5)/B5', '=(B6-C6)/B6']
-    }
-    df_remuneration = pd.DataFrame(remuneration_data)
-    df_remuneration.to_excel(writer, sheet_name='Rémunérations', index=False)
-    worksheet = writer.sheets['Rémunérations']
+    categories = ['Cadres', 'Ingénieurs', 'Techniciens', 'Administratifs', 'Ouvriers']
+    worksheet = workbook.add_worksheet('Rémunérations')
     worksheet.set_column('A:A', 15)
     worksheet.set_column('B:E', 20)
+    worksheet.write_row(0, 0, ('Catégorie', 'Rémunération moyenne hommes', 'Rémunération moyenne femmes', 'Écart salarial'), header_format)
     
-    # Format des montants et pourcentages
-    for row in range(1, 6):
-        worksheet.write(f'B{row+1}', None, currency_format)
-        worksheet.write(f'C{row+1}', None, currency_format)
-        worksheet.write(f'D{row+1}', None, percent_format)
+    # Montants au format monétaire, écart (hommes - femmes) / hommes au format pourcentage
+    for row, categorie in enumerate(categories, start=1):
+        rem_h = xl_rowcol_to_cell(row, 1)
+        rem_f = xl_rowcol_to_cell(row, 2)
+        worksheet.write_string(row, 0, categorie)
+        worksheet.write_row(row, 1, (0, 0), currency_format)
+        worksheet.write_formula(row, 3, f'=({rem_h}-{rem_f})/{rem_h}', percent_format, _RATIO_VIDE)
 
     # Feuille Formation et Recrutement
-    formation_data = {
-        'Indicateur': [
-            'Nombre de stagiaires',
-            'Nombre d\'apprentis',
-            'Nombre de contrats de professionnalisation',
-            'Nombre de CDI',
-            'Nombre de CDD',
-            'Nombre d\'heures de formation',
-            'Nombre de recrutements internes',
-            'Nombre de recrutements externes',
-            'Nombre d\'employés en temps partiel',
-            'Nombre d\'employés en télétravail',
-            'Nombre de promotions femmes',
-            'Nombre total de promotions'
-        ],
-        'Valeur': [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-        'Unité': ['Personnes', 'Personnes', 'Personnes', 'Personnes', 'Personnes', 'Heures', 'Personnes', 'Personnes', 'Personnes', 'Personnes', 'Personnes', 'Personnes']
-    }
-    df_formation = pd.DataFrame(formation_data)
-    df_formation.to_excel(writer, sheet_name='Formation et Recrutement', index=False)
-    worksheet = writer.sheets['Formation et Recrutement']
+    # (indicateur, valeur par défaut, unité)
+    formation_rows = [
+        ('Nombre de stagiaires', 0, 'Personnes'),
+        ('Nombre d\'apprentis', 0, 'Personnes'),
+        ('Nombre de contrats de professionnalisation', 0, 'Personnes'),
+        ('Nombre de CDI', 0, 'Personnes'),
+        ('Nombre de CDD', 0, 'Personnes'),
+        ('Nombre d\'heures de formation', 0, 'Heures'),
+        ('Nombre de recrutements internes', 0, 'Personnes'),
+        ('Nombre de recrutements externes', 0, 'Personnes'),
+        ('Nombre d\'employés en temps partiel', 0, 'Personnes'),
+        ('Nombre d\'employés en télétravail', 0, 'Personnes'),
+        ('Nombre de promotions femmes', 0, 'Personnes'),
+        ('Nombre total de promotions', 0, 'Personnes')
+    ]
+    worksheet = workbook.add_worksheet('Formation et Recrutement')
     worksheet.set_column('A:A', 40)
     worksheet.set_column('B:C', 15)
     
     # Validation des données numériques
-    for row in range(1, 13):
-        worksheet.data_validation(f'B{row+1}', {'validate': 'decimal', 'criteria': '>=', 'value': 0})
+    worksheet.data_validation('B2:B13', {'validate': 'decimal', 'criteria': '>=', 'value': 0})
+    
+    worksheet.write_row(0, 0, ('Indicateur', 'Valeur', 'Unité'), header_format)
+    for row, (indicateur, val, unite) in enumerate(formation_rows, start=1):
+        worksheet.write_string(row, 0, indicateur)
+        worksheet.write_number(row, 1, val, number_format)
+        worksheet.write_string(row, 2, unite)
 
     # Feuille Calculs automatiques
-    calculs_data = {
-        'Indicateur': [
-            'Taux de féminisation',
-            'Taux de femmes cadres',
-            'Taux de handicap',
-            'Écart salarial moyen',
-            'Score diversité des âges',
-            'Taux de CDI',
-            'Taux de formation',
-            'Taux de recrutement interne',
-            'Taux de temps partiel',
-            'Taux de télétravail',
-            'Taux de promotion des femmes'
-        ],
-        'Formule': [
-            '=Données générales!B4/Données générales!B3',
-            '=Rémunérations!C2/Rémunérations!B2',
-            '=Données générales!B6/Données générales!B3',
-            '=AVERAGE(Rémunérations!D2:D6)',
-            '=1-MAX(ABS(Répartition par âge!C2:C7-0.167))',
-            '=Formation et Recrutement!B4/(Formation et Recrutement!B4+Formation et Recrutement!B5)',
-            '=Formation et Recrutement!B6/(Données générales!B3*1600)',
-            '=Formation et Recrutement!B7/(Formation et Recrutement!B7+Formation et Recrutement!B8)',
-            '=Formation et Recrutement!B9/Données générales!B3',
-            '=Formation et Recrutement!B10/Données générales!B3',
-            '=Formation et Recrutement!B11/Formation et Recrutement!B12'
-        ],
-        'Valeur': ['', '', '', '', '', '', '', '', '', '', ''],
-        'Objectif': ['40%', '40%', '6%', '<5%', '>70%', '>80%', '>5%', '>30%', '<20%', '>20%', '>40%'],
-        'Seuil légal': ['-', '-', '6%', '-', '-', '-', '-', '-', '-', '-', '-'],
-        'Explication': [
-            'Nombre de femmes / Effectif total',
-            'Nombre de femmes cadres / Nombre total de cadres',
-            'Nombre de personnes en situation de handicap / Effectif total',
-            'Moyenne des écarts salariaux par catégorie',
-            'Mesure de la diversité des âges (1 - écart max à la répartition idéale)',
-            'Nombre de CDI / (Nombre de CDI + Nombre de CDD)',
-            'Nombre d\'heures de formation / (Effectif total * 1600)',
-            'Nombre de recrutements internes / Nombre total de recrutements',
-            'Nombre d\'employés en temps partiel / Effectif total',
-            'Nombre d\'employés en télétravail / Effectif total',
-            'Nombre de promotions femmes / Nombre total de promotions'
-        ]
-    }
-    df_calculs = pd.DataFrame(calculs_data)
-    df_calculs.to_excel(writer, sheet_name='Calculs automatiques', index=False)
-    worksheet = writer.sheets['Calculs automatiques']
+    worksheet = workbook.add_worksheet('Calculs automatiques')
     worksheet.set_column('A:A', 25)
     worksheet.set_column('B:B', 50)
     worksheet.set_column('C:E', 15)
     worksheet.set_column('F:F', 60)
+    # Feuille protégée
+    worksheet.protect()
+    worksheet.write_row(0, 0, ('Indicateur', 'Formule', 'Valeur', 'Objectif', 'Seuil légal', 'Explication'), header_format)
     
-    # Format des pourcentages
-    for row in range(1, 12):
-        worksheet.write(f'C{row+1}', None, percent_format)
-
-    # Protection des feuilles
-    for sheet_name in ['Calculs automatiques']:
-        worksheet = writer.sheets[sheet_name]
-        worksheet.protect()
+    # La formule est affichée en colonne B et calculée en colonne C (format pourcentage)
+    for row, ((indicateur, objectif, seuil, explication), formule) in enumerate(zip(_CALCULS_ROWS, _CALCULS_FORMULAS), start=1):
+        worksheet.write_string(row, 0, indicateur)
+        worksheet.write_string(row, 1, formule)
+        worksheet.write_formula(row, 2, formule, percent_format, _RATIO_VIDE)
+        worksheet.write_row(row, 3, (objectif, seuil, explication))
 
     # Sauvegarde du fichier
-    writer.close()
+    workbook.close()
+
+def create_excel_model(output=MODEL_PATH):
+    # output : chemin du fichier à créer ou objet fichier (io.BytesIO, ...)
+    if not isinstance(output, str):
+        _build_model(output)
+        return
+
+    # Un fichier déjà généré est conservé tant que le générateur n'a pas changé
+    signature_path = os.path.splitext(output)[0] + '.sig'
+    signature = _signature()
+    if os.path.exists(output) and os.path.exists(signature_path):
+        with open(signature_path, encoding='utf-8') as f:
+            if f.read() == signature:
+                return
+
+    # Écriture dans un fichier temporaire du même dossier puis renommage atomique :
+    # une génération interrompue ne laisse jamais de classeur tronqué à la place du modèle
+    fd, tmp_path = tempfile.mkstemp(suffix='.xlsx', dir=os.path.dirname(os.path.abspath(output)))
+    os.close(fd)
+    # mkstemp crée le fichier en 0600 : on applique les droits qu'aurait donnés open() (0666 moins le umask)
+    umask = os.umask(0)
+    os.umask(umask)
+    os.chmod(tmp_path, 0o666 & ~umask)
+    try:
+        _build_model(tmp_path)
+        os.replace(tmp_path, output)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    with open(signature_path, 'w', encoding='utf-8') as f:
+        f.write(signature)
 
 if __name__ == '__main__':
-    create_excel_model() 
\ No newline at end of file
+    create_excel_model()
\ No newline at end of file
@@ -1,7 +1,7 @@
 import streamlit as st
 import os
-import sys
-import subprocess
+import io
+from create_excel_model_v3 import create_excel_model
 
 # Configuration de la page
 st.set_page_config(
@@ -10,49 +10,25 @@ st.set_page_config(
     layout="wide"
 )
 
-# Style CSS personnalisé
-st.markdown("""
-<style>
-    .main {
-        background-color: #f5f5f5;
-    }
-    .stButton>button {
-        width: 100%;
-        height: 100px;
-        font-size: 24px;
-        margin: 10px 0;
-        background-color: #1E3A8A;
-        color: white;
-    }
-    .stButton>button:hover {
-        background-color: #2563EB;
-    }
-    .title {
-        text-align: center;
-        color: #1E3A8A;
-        font-size: 48px;
-        margin-bottom: 30px;
-    }
-    .subtitle {
-        text-align: center;
-        color: #4B5563;
-        font-size: 24px;
-        margin-bottom: 50px;
-    }
-    .footer {
-        text-align: center;
-        color: #6B7280;
-        margin-top: 50px;
-    }
-    .card {
-        background-color: white;
-        border-radius: 10px;
-        padding: 20px;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        margin: 10px 0;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Pages des applications (chemins relatifs au script principal)
+_HERE = os.path.dirname(__file__)
+_APPS = {
+    "converter": "pages/converter.py",
+    "evaluation": "pages/v6.py",
+}
+
+# Présence des pages, vérifiée une seule fois par processus
+@st.cache_resource(show_spinner=False)
+def apps_exist():
+    return {name: os.path.exists(os.path.join(_HERE, page)) for name, page in _APPS.items()}
+
+# Style CSS personnalisé (static/menu.css, lu une seule fois)
+@st.cache_data(show_spinner=False)
+def load_css():
+    with open(os.path.join(_HERE, "static", "menu.css"), encoding="utf-8") as f:
+        return f"<style>\n{f.read()}</style>"
+
+st.markdown(load_css(), unsafe_allow_html=True)
 
 # Titre et introduction
 st.markdown('<h1 class="title">🏢 Diversité & Inclusion</h1>', unsafe_allow_html=True)
@@ -62,20 +38,14 @@ st.markdown('<p class="subtitle">Plateforme d\'évaluation et d\'analyse de la d
 col1, col2 = st.columns(2)
 
 # Fonction pour lancer une application
+# (les applications sont des pages du dossier pages/ : elles s'ouvrent dans le même serveur et la même session)
 def launch_app(app_name):
+    page = _APPS[app_name]
+    if not apps_exist()[app_name]:
+        st.error(f"Le fichier {page} n'existe pas.")
+        return
     try:
-        if app_name == "converter":
-            script_path = os.path.join(os.path.dirname(__file__), "converter.py")
-            if not os.path.exists(script_path):
-                st.error(f"Le fichier {script_path} n'existe pas.")
-                return
-            subprocess.Popen([sys.executable, "-m", "streamlit", "run", script_path])
-        elif app_name == "evaluation":
-            script_path = os.path.join(os.path.dirname(__file__), "v6.py")
-            if not os.path.exists(script_path):
-                st.error(f"Le fichier {script_path} n'existe pas.")
-                return
-            subprocess.Popen([sys.executable, "-m", "streamlit", "run", script_path])
+        st.switch_page(page)
     except Exception as e:
         st.error(f"Erreur lors du lancement de l'application : {str(e)}")
         st.error("Veuillez vérifier que tous les fichiers nécessaires sont présents et que les dépendances sont installées.")
@@ -102,9 +72,22 @@ with col2:
         launch_app("evaluation")
     st.markdown('</div>', unsafe_allow_html=True)
 
-# Section d'aide
-st.markdown("---")
-st.markdown("""
+# Modèle Excel de bilan social, généré en mémoire une seule fois par processus
+@st.cache_resource(show_spinner=False)
+def model_bytes():
+    buffer = io.BytesIO()
+    create_excel_model(buffer)
+    return buffer.getvalue()
+
+st.download_button(
+    label="📥 Télécharger le modèle de bilan social (Excel)",
+    data=model_bytes(),
+    file_name="modele_bilan_social_v3.xlsx",
+    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+)
+
+# Section d'aide et pied de page (contenu statique, envoyé en un seul bloc)
+_GUIDE_TEXT = """
 ### 📚 Guide d'utilisation
 
 1. **Convertisseur de Bilan Social**
@@ -118,15 +101,18 @@ st.markdown("""
    - Téléchargez le rapport PDF
 
 ### 🔧 Prérequis
-- Python 3.7 ou supérieur
-- Packages requis : streamlit, pandas, numpy, matplotlib, altair, plotly, reportlab, kaleido
+- Python 3.9 ou supérieur
+- Packages requis : streamlit, pandas, numpy, plotly, reportlab, xlsxwriter, python-calamine, pyarrow, orjson, python-dotenv
 - Pour installer les dépendances : `pip install -r requirements.txt`
-""")
+"""
 
-# Pied de page
-st.markdown("""
+_FOOTER_HTML = """
 <div class="footer">
     <p>Développé par Japhet Calixte N'DRI | Version 1.0</p>
     <p>© 2024 Tous droits réservés</p>
 </div>
-""", unsafe_allow_html=True) 
\ No newline at end of file
+"""
+
+_STATIC_TAIL = "---\n\n" + _GUIDE_TEXT + "\n\n" + _FOOTER_HTML
+
+st.markdown(_STATIC_TAIL, unsafe_allow_html=True)
\ No newline at end of file
@@ -0,0 +1,289 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+from datetime import datetime
+import io
+import xlsxwriter
+
+# Moteur de lecture Excel : calamine (natif, plus rapide) si disponible, sinon openpyxl
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = "openpyxl"
+
+# Configuration de la page
+st.set_page_config(
+    page_title="Convertisseur Bilan Social",
+    page_icon="🔄",
+    layout="wide"
+)
+
+# Titre et introduction
+st.title("🔄 Convertisseur de Bilan Social")
+st.markdown("""
+Cette application vous permet de convertir les données de votre bilan social au format requis pour l'évaluation de la diversité et inclusion.
+""")
+
+# Lignes du modèle Excel : (information, valeur par défaut, unité)
+TEMPLATE_ROWS = [
+    ('Nom de l\'entreprise', '', ''),
+    ('Année', '', ''),
+    ('Effectif total', 0, 'personnes'),
+    ('Nombre de femmes', 0, 'personnes'),
+    ('Nombre de cadres', 0, 'personnes'),
+    ('Nombre de femmes cadres', 0, 'personnes'),
+    ('Nombre de salariés en situation de handicap', 0, 'personnes'),
+    ('Nombre de jours travaillés', 0, 'jours'),
+    ('Nombre de jours d\'absence', 0, 'jours'),
+    ('Répartition par âge - Moins de 30 ans', 0, 'personnes'),
+    ('Répartition par âge - 30-50 ans', 0, 'personnes'),
+    ('Répartition par âge - Plus de 50 ans', 0, 'personnes'),
+    ('Salaire moyen hommes (€)', 0, '€'),
+    ('Salaire moyen femmes (€)', 0, '€')
+]
+
+# Fonction pour créer le modèle Excel (mise en cache : le contenu est constant)
+@st.cache_data(show_spinner=False)
+def create_excel_template() -> bytes:
+    # Création du fichier Excel directement avec xlsxwriter
+    output = io.BytesIO()
+    workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+    worksheet = workbook.add_worksheet('Données')
+    
+    # Format pour les en-têtes
+    header_format = workbook.add_format({
+        'bold': True,
+        'bg_color': '#4472C4',
+        'font_color': 'white',
+        'border': 1
+    })
+    
+    # Format pour les nombres
+    number_format = workbook.add_format({'num_format': '#,##0'})
+    
+    # Ajuster les largeurs de colonnes
+    worksheet.set_column('A:A', 40)
+    worksheet.set_column('B:C', 20)
+    
+    # En-têtes et données
+    worksheet.write_row(0, 0, ['Information', 'Valeur', 'Unité'], header_format)
+    for row, (info, val, unit) in enumerate(TEMPLATE_ROWS, start=1):
+        worksheet.write_string(row, 0, info)
+        if val == '':
+            worksheet.write_blank(row, 1, None, number_format)
+        else:
+            worksheet.write_number(row, 1, val, number_format)
+        if unit:
+            worksheet.write_string(row, 2, unit)
+    
+    workbook.close()
+    return output.getvalue()
+
+# Champs numériques du modèle
+CHAMPS_NUMERIQUES = [info for info, val, _ in TEMPLATE_ROWS if val != '']
+
+# Règles de validation appliquées par convert_data, dans l'ordre de priorité des messages :
+# (champ, borne basse 'gt' (> 0) ou 'ge' (>= 0), champ servant de borne haute ou None, message)
+VALIDATIONS = (
+    ('Effectif total', 'gt', None,
+     "L'effectif total doit être supérieur à 0"),
+    ('Nombre de femmes', 'ge', 'Effectif total',
+     "Le nombre de femmes doit être compris entre 0 et l'effectif total"),
+    ('Nombre de cadres', 'ge', 'Effectif total',
+     "Le nombre de cadres doit être compris entre 0 et l'effectif total"),
+    ('Nombre de femmes cadres', 'ge', 'Nombre de cadres',
+     "Le nombre de femmes cadres doit être compris entre 0 et le nombre total de cadres"),
+    ('Nombre de salariés en situation de handicap', 'ge', 'Effectif total',
+     "Le nombre de salariés en situation de handicap doit être compris entre 0 et l'effectif total"),
+    ('Nombre de jours travaillés', 'gt', None,
+     "Le nombre de jours travaillés doit être supérieur à 0"),
+    ('Nombre de jours d\'absence', 'ge', None,
+     "Le nombre de jours d'absence ne peut pas être négatif"),
+    ('Salaire moyen hommes (€)', 'gt', None,
+     "Les salaires moyens doivent être supérieurs à 0"),
+    ('Salaire moyen femmes (€)', 'gt', None,
+     "Les salaires moyens doivent être supérieurs à 0")
+)
+VALIDATIONS_STRICTES = np.array([borne == 'gt' for _, borne, _, _ in VALIDATIONS])
+INDICES_VALIDATIONS = np.array([CHAMPS_NUMERIQUES.index(champ) for champ, _, _, _ in VALIDATIONS])
+
+# Échappement d'une valeur pour le CSV : seuls les textes (nom de l'entreprise)
+# peuvent nécessiter des guillemets, les nombres sont écrits tels quels
+def _csv_field(value):
+    if not isinstance(value, str):
+        return str(value)
+    if any(c in value for c in ',"\r\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+# Fonction pour convertir les données
+def convert_data(df):
+    try:
+        # Vérification des données requises
+        required_fields = ['Information', 'Valeur']
+        if not all(field in df.columns for field in required_fields):
+            raise ValueError("Le fichier Excel doit contenir les colonnes 'Information' et 'Valeur'")
+        
+        # Indexation des valeurs par libellé (indépendant de l'ordre des lignes)
+        vals = dict(zip(df['Information'].astype(str), df['Valeur']))
+        
+        # Extraction des données
+        nom_entreprise = str(vals['Nom de l\'entreprise'])
+        if not nom_entreprise:
+            raise ValueError("Le nom de l'entreprise est requis")
+            
+        annee = int(vals['Année'])
+        current_year = datetime.now().year
+        if annee < 2000 or annee > current_year:
+            raise ValueError(f"L'année doit être comprise entre 2000 et {current_year}")
+        
+        # Conversion numérique de tous les champs en un seul appel vectorisé
+        valeurs_num = pd.to_numeric(
+            pd.Series([vals[champ] for champ in CHAMPS_NUMERIQUES], dtype=object), errors='raise'
+        ).to_numpy(dtype=np.float64)
+        nums = dict(zip(CHAMPS_NUMERIQUES, valeurs_num.tolist()))
+        
+        # Application de la table VALIDATIONS en une seule comparaison vectorisée
+        valeurs = valeurs_num[INDICES_VALIDATIONS]
+        bornes_max = np.array([nums[borne] if borne else np.inf for _, _, borne, _ in VALIDATIONS], dtype=np.float64)
+        invalides = np.where(VALIDATIONS_STRICTES, valeurs <= 0, valeurs < 0) | (valeurs > bornes_max)
+        if invalides.any():
+            raise ValueError(VALIDATIONS[int(invalides.argmax())][3])
+        
+        effectif_total = nums['Effectif total']
+        nb_femmes = nums['Nombre de femmes']
+        nb_cadres = nums['Nombre de cadres']
+        nb_femmes_cadres = nums['Nombre de femmes cadres']
+        nb_handicap = nums['Nombre de salariés en situation de handicap']
+        jours_travailles = nums['Nombre de jours travaillés']
+        jours_absence = nums['Nombre de jours d\'absence']
+        salaire_hommes = nums['Salaire moyen hommes (€)']
+        salaire_femmes = nums['Salaire moyen femmes (€)']
+        moins_30 = nums['Répartition par âge - Moins de 30 ans']
+        entre_30_50 = nums['Répartition par âge - 30-50 ans']
+        plus_50 = nums['Répartition par âge - Plus de 50 ans']
+        
+        # Vérification de la cohérence des effectifs par âge
+        total_age = moins_30 + entre_30_50 + plus_50
+        if abs(total_age - effectif_total) > 1:  # Tolérance de 1 personne pour les arrondis
+            raise ValueError("La somme des effectifs par âge doit correspondre à l'effectif total")
+        
+        # Calcul des pourcentages
+        taux_feminisation = (nb_femmes / effectif_total) * 100
+        taux_femmes_cadres = (nb_femmes_cadres / nb_cadres) * 100 if nb_cadres > 0 else 0
+        taux_handicap = (nb_handicap / effectif_total) * 100
+        
+        # Calcul des pourcentages par âge
+        moins_30_pct = (moins_30 / effectif_total) * 100
+        entre_30_50_pct = (entre_30_50 / effectif_total) * 100
+        plus_50_pct = (plus_50 / effectif_total) * 100
+        
+        # Calcul de l'écart salarial
+        ecart_salaire = ((salaire_hommes - salaire_femmes) / salaire_hommes) * 100
+        
+        # Calcul du taux d'absentéisme
+        taux_absenteisme = (jours_absence / jours_travailles) * 100
+        
+        # Données de sortie : paires (indicateur, valeur) et CSV encodé directement en octets
+        pairs = [
+            ('nom_entreprise', nom_entreprise),
+            ('annee', annee),
+            ('taux_feminisation', taux_feminisation),
+            ('taux_femmes_cadres', taux_femmes_cadres),
+            ('taux_handicap', taux_handicap),
+            ('ecart_salaire', ecart_salaire),
+            ('moins_30_ans', moins_30_pct),
+            ('entre_30_50_ans', entre_30_50_pct),
+            ('plus_50_ans', plus_50_pct),
+            ('taux_absenteisme', taux_absenteisme)
+        ]
+        buf = io.BytesIO()
+        buf.write(b"Indicateur,Valeur\n")
+        buf.writelines(f"{k},{_csv_field(v)}\n".encode('utf-8') for k, v in pairs)
+        
+        return buf.getvalue(), pairs
+    
+    except ValueError as ve:
+        st.error(f"Erreur de validation des données : {str(ve)}")
+        return None
+    except Exception as e:
+        st.error(f"Erreur lors de la conversion des données : {str(e)}")
+        return None
+
+# Lecture et conversion du fichier importé (mise en cache sur le contenu du fichier)
+@st.cache_data(show_spinner=False)
+def _parse_and_convert(file_bytes: bytes):
+    df = pd.read_excel(io.BytesIO(file_bytes), engine=EXCEL_ENGINE, usecols="A:B", nrows=14, header=0)
+    return convert_data(df)
+
+# Interface principale
+st.markdown("## 📝 Instructions")
+st.markdown("""
+1. Téléchargez d'abord le modèle Excel
+2. Remplissez-le avec les données de votre bilan social
+3. Téléchargez le fichier rempli
+4. L'application convertira automatiquement les données au format requis
+""")
+
+# Bouton pour télécharger le modèle
+st.markdown("### 1. Télécharger le modèle")
+# Modèle conservé pour la session (create_excel_template est en plus partagé entre sessions via cache_data)
+if 'template_bytes' not in st.session_state:
+    st.session_state.template_bytes = create_excel_template()
+st.download_button(
+    label="📥 Télécharger le modèle Excel",
+    data=st.session_state.template_bytes,
+    file_name="modele_bilan_social.xlsx",
+    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+)
+
+# Section pour télécharger le fichier rempli
+st.markdown("### 2. Télécharger votre fichier rempli")
+uploaded_file = st.file_uploader("Choisissez votre fichier Excel rempli", type=['xlsx'])
+
+if uploaded_file is not None:
+    # Horodatage du fichier CSV figé par fichier importé (stable d'un rerun à l'autre)
+    if st.session_state.get('csv_file_id') != uploaded_file.file_id:
+        st.session_state.csv_file_id = uploaded_file.file_id
+        st.session_state.csv_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    
+    try:
+        # Lecture et conversion des données
+        converted = _parse_and_convert(uploaded_file.getvalue())
+        
+        if converted is not None:
+            csv, pairs = converted
+            st.success("✅ Conversion réussie !")
+            
+            # Affichage des données converties
+            st.markdown("### 3. Données converties")
+            st.dataframe({
+                'Indicateur': [k for k, _ in pairs],
+                'Valeur': [v for _, v in pairs]
+            })
+            
+            # Bouton pour télécharger le fichier CSV
+            st.download_button(
+                label="📥 Télécharger le fichier CSV",
+                data=csv,
+                file_name=f"donnees_di_{st.session_state.csv_timestamp}.csv",
+                mime="text/csv"
+            )
+            
+            st.markdown("""
+            ### 4. Prochaines étapes
+            1. Téléchargez le fichier CSV généré
+            2. Importez-le dans l'application d'évaluation D&I
+            3. Consultez votre rapport détaillé
+            """)
+    
+    except Exception as e:
+        st.error(f"Erreur lors du traitement du fichier : {str(e)}")
+        st.error("Veuillez vérifier que le fichier est correctement formaté.")
+
+# Pied de page
+st.markdown("---")
+st.markdown("""
+**Convertisseur Bilan Social** | Développé par Japhet Calixte N'DRI | Version 1.0
+""") 
\ No newline at end of file
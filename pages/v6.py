@@ -0,0 +1,1127 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import io
+import plotly.graph_objects as go
+import plotly.express as px
+import time
+import urllib.request
+from datetime import datetime
+
+# Moteurs de lecture : calamine (Excel) et pyarrow (CSV), natifs et plus rapides, si disponibles
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = "openpyxl"
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    CSV_ENGINE = "c"
+
+# Configuration de la page Streamlit
+st.set_page_config(
+    page_title="Évaluateur D&I",
+    page_icon="📊",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Titre et introduction de l'application
+st.title("📊 Évaluateur de Diversité et Inclusion en Entreprise")
+st.markdown("""
+Cette application analyse les indicateurs sociaux d'une entreprise en matière de diversité et inclusion,
+et attribue des notes de A à E sur 6 dimensions clés, basées sur des seuils adaptés au secteur énergie/industrie.
+""")
+
+# Fonction pour convertir un score numérique en note de A à E
+def chiffre_vers_note(score):
+    """
+    Convertit un score numérique en note de A à E.
+    
+    Args:
+        score: Un nombre entre 1 et 5
+    
+    Returns:
+        Une lettre entre A et E
+    """
+    if score >= 4.5:
+        return "A"
+    elif score >= 3.5:
+        return "B"
+    elif score >= 2.5:
+        return "C"
+    elif score >= 1.5:
+        return "D"
+    else:
+        return "E"
+
+# Fonction pour calculer la répartition équilibrée des âges
+def calculer_equilibre_age(age_pcts):
+    """
+    Calcule un score d'équilibre des âges, sur 100.
+    Un score de 100 représente une distribution parfaitement équilibrée (100/3 % dans chaque catégorie) ;
+    pour des pourcentages de somme 100, le minimum est 100/3 ≈ 33,3 (tout l'effectif dans une seule tranche).
+    
+    Args:
+        age_pcts: Pourcentages (< 30 ans, 30-50 ans, > 50 ans), pour une entreprise (3 valeurs)
+                  ou pour plusieurs à la fois (tableau N x 3)
+    
+    Returns:
+        Le score (ou un tableau de N scores)
+    """
+    # Écart moyen à la distribution idéale, rapporté à 200/3 (l'écart maximal d'une seule tranche) :
+    # tout dans une tranche donne des écarts (200/3, 100/3, 100/3), soit un écart moyen de 400/9 et un score de 100/3
+    ecart_moyen = np.abs(np.asarray(age_pcts, dtype=float) - 100 / 3).mean(axis=-1)
+    return (1 - ecart_moyen / (200 / 3)) * 100
+
+# Correction des seuils pour le secteur énergie/industrie
+seuils = {
+    "taux_feminisation": [40, 35, 30, 25],  # % (augmenté pour refléter les objectifs du secteur)
+    "taux_femmes_cadres": [35, 30, 25, 20],  # % (ajusté selon les objectifs 2025)
+    "taux_handicap": [6, 5, 4, 3],  # % (maintenu avec le seuil légal de 6%)
+    "ecart_salaire": [2, 4, 8, 12],  # % (réduit pour plus d'ambition)
+    "equilibre_age": [85, 75, 65, 55],  # % (augmenté pour favoriser la diversité des âges)
+    "taux_absenteisme": [2.5, 3.5, 4.5, 5.5]  # % (ajusté selon les standards du secteur)
+}
+
+# Indicateurs notés : (libellé, clé dans les seuils, une valeur plus élevée est meilleure)
+INDICATEURS_NOTES = (
+    ("Taux de féminisation global", "taux_feminisation", True),
+    ("Taux de femmes cadres", "taux_femmes_cadres", True),
+    ("Taux d'emploi handicap", "taux_handicap", True),
+    ("Écart de salaire H/F", "ecart_salaire", False),
+    ("Équilibre des âges", "equilibre_age", True),
+    ("Taux d'absentéisme", "taux_absenteisme", False)
+)
+LIBELLES_NOTES = [libelle for libelle, _, _ in INDICATEURS_NOTES]
+CLES_NOTES = [cle for _, cle, _ in INDICATEURS_NOTES]
+
+# Grille des seuils (6 x 4) et sens de notation, dans l'ordre de INDICATEURS_NOTES
+SEUILS_GRILLE = np.array([seuils[cle] for cle in CLES_NOTES], dtype=float)
+SENS_CROISSANT = np.array([croissant for _, _, croissant in INDICATEURS_NOTES])
+LETTRES_PAR_SEUILS = np.array(list("EDCBA"))
+
+# Fonction pour noter un lot d'entreprises (une ligne par entreprise) en une seule opération
+def noter_lot(valeurs):
+    """
+    Calcule le nombre de seuils atteints pour chaque indicateur d'un lot d'entreprises.
+    
+    Args:
+        valeurs: Tableau (N, 6) des valeurs, colonnes dans l'ordre de INDICATEURS_NOTES
+    
+    Returns:
+        Un tableau (N, 6) d'entiers de 0 (note E) à 4 (note A)
+    """
+    valeurs = np.asarray(valeurs, dtype=float)[..., None]
+    # Nombre de seuils atteints (0 à 4) : c'est la position de la valeur dans la grille triée
+    return np.where(SENS_CROISSANT[:, None], valeurs >= SEUILS_GRILLE, valeurs <= SEUILS_GRILLE).sum(axis=-1)
+
+# Fonction pour noter les six indicateurs d'une entreprise
+def noter_indicateurs(indicateurs):
+    """
+    Attribue les notes de A à E et les scores de 1 à 5 de tous les indicateurs.
+    
+    Args:
+        indicateurs: Dictionnaire des valeurs, indexé par les clés de INDICATEURS_NOTES
+    
+    Returns:
+        Un tuple (notes, scores) de tableaux NumPy dans l'ordre de INDICATEURS_NOTES
+    """
+    atteints = noter_lot([[indicateurs[cle] for cle in CLES_NOTES]])[0]
+    return LETTRES_PAR_SEUILS[atteints], atteints + 1
+
+# Explication des indicateurs
+st.markdown("## 📌 Explication des indicateurs")
+st.write("""
+1. **Taux de féminisation global** : Pourcentage de femmes dans l'effectif total
+2. **Taux de femmes cadres** : Pourcentage de femmes parmi les postes de cadres
+3. **Taux d'emploi des personnes en situation de handicap** : Pourcentage de salariés en situation de handicap (seuil légal = 6%)
+4. **Écart de salaire hommes/femmes** : Écart moyen en % à poste équivalent (0% = parfaite égalité)
+5. **Répartition des effectifs par âge** : Équilibre entre les tranches d'âge (<30 ans, 30-50 ans, >50 ans)
+6. **Taux d'absentéisme** : Pourcentage de jours d'absence par rapport au nombre total de jours travaillés
+""")
+
+# Affichage des seuils de notation pour chaque indicateur
+st.markdown("## 📏 Grilles de notation")
+
+# Libellés des grilles de notation, dans l'ordre de INDICATEURS_NOTES : (clé, libellé, préfixe du critère A)
+GRILLES = (
+    ("taux_feminisation", "Taux de féminisation global", ""),
+    ("taux_femmes_cadres", "Taux de femmes cadres", ""),
+    ("taux_handicap", "Taux d'emploi des personnes en situation de handicap", ""),
+    ("ecart_salaire", "Écart de salaire hommes/femmes", ""),
+    ("equilibre_age", "Répartition des effectifs par âge", "Score d'équilibre "),
+    ("taux_absenteisme", "Taux d'absentéisme", "")
+)
+
+# Fonction pour formuler les critères des notes A à E d'un indicateur
+def grille_rows(seuils_indicateur, ordre_croissant=True, prefixe=""):
+    """
+    Formule les critères des notes A à E à partir des 4 seuils d'un indicateur.
+    
+    Args:
+        seuils_indicateur: Les 4 seuils [seuil_A, seuil_B, seuil_C, seuil_D]
+        ordre_croissant: Si True, une valeur plus élevée donne une meilleure note
+        prefixe: Texte ajouté devant le critère de la note A
+    
+    Returns:
+        La liste des 5 critères, de A à E
+    """
+    a, b, c, d = seuils_indicateur
+    if ordre_croissant:
+        return [f"{prefixe}≥ {a}%", f"{b}% à {a-0.1}%", f"{c}% à {b-0.1}%", f"{d}% à {c-0.1}%", f"< {d}%"]
+    return [f"{prefixe}≤ {a}%", f"{a+0.1}% à {b}%", f"{b+0.1}% à {c}%", f"{c+0.1}% à {d}%", f"> {d}%"]
+
+# Construction des grilles de notation (mise en cache : les seuils ne changent pas d'une exécution à l'autre)
+@st.cache_data(show_spinner=False)
+def construire_grilles(seuils_items):
+    """
+    Construit les tableaux des grilles de notation à partir des seuils.
+    
+    Args:
+        seuils_items: Seuils sous forme hashable ((indicateur, (seuil_A, ..., seuil_D)), ...)
+    
+    Returns:
+        Un DataFrame des critères, avec les notes A à E en index et un indicateur par colonne
+    """
+    seuils = dict(seuils_items)
+    
+    return pd.DataFrame(
+        {
+            libelle: grille_rows(seuils[cle], croissant, prefixe)
+            for (cle, libelle, prefixe), (_, _, croissant) in zip(GRILLES, INDICATEURS_NOTES)
+        },
+        index=pd.Index(list("ABCDE"), name="Note")
+    )
+
+grilles_notation = construire_grilles(tuple((cle, tuple(valeurs)) for cle, valeurs in seuils.items()))
+
+# Afficher les six grilles de notation dans un seul tableau
+st.dataframe(grilles_notation, use_container_width=True)
+
+# Modèles de fichier à télécharger (CSV et Excel), construits une seule fois
+@st.cache_data(show_spinner=False)
+def construire_modeles():
+    template_data = {
+        "Indicateur": [
+            "nom_entreprise", "annee", "taux_feminisation", "taux_femmes_cadres", 
+            "ecart_salaire", "taux_handicap", "moins_30_ans", "entre_30_50_ans", 
+            "plus_50_ans", "taux_absenteisme"
+        ],
+        "Valeur": ["EDF SA", 2022, 30.0, 28.0, 5.0, 5.5, 15.0, 45.0, 40.0, 4.2]
+    }
+    template_df = pd.DataFrame(template_data)
+    
+    excel_buffer = io.BytesIO()
+    template_df.to_excel(excel_buffer, index=False)
+    return template_df.to_csv(index=False), excel_buffer.getvalue()
+
+# Méthode d'entrée des données
+st.markdown("## 📝 Entrée des données")
+methode = st.radio("Choisissez la méthode d'entrée des données:", 
+                  ["Saisie manuelle", "Téléchargement de fichier CSV/Excel"])
+
+# Variables pour stocker les données saisies
+indicateurs = {}
+
+if methode == "Saisie manuelle":
+    # Formulaire de saisie : le script n'est relancé qu'à la validation, pas à chaque champ modifié.
+    # Le bouton de validation lance aussi l'évaluation, avec les valeurs qui viennent d'être soumises.
+    with st.form("saisie_donnees"):
+        # Créer deux colonnes pour l'entrée des données
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("Données générales")
+            nom_entreprise = st.text_input("Nom de l'entreprise", "EDF SA")
+            annee = st.number_input("Année", min_value=2000, max_value=2030, value=2022)
+            
+            st.subheader("Mixité et égalité professionnelle")
+            indicateurs["taux_feminisation"] = st.number_input("Taux de féminisation global (%)", 
+                                                             min_value=0.0, max_value=100.0, value=30.0)
+            indicateurs["taux_femmes_cadres"] = st.number_input("Taux de femmes cadres (%)", 
+                                                              min_value=0.0, max_value=100.0, value=28.0)
+            indicateurs["ecart_salaire"] = st.number_input("Écart de salaire hommes/femmes (%)", 
+                                                          min_value=0.0, max_value=50.0, value=5.0)
+        
+        with col2:
+            st.subheader("Inclusion et diversité")
+            indicateurs["taux_handicap"] = st.number_input("Taux d'emploi des personnes en situation de handicap (%)", 
+                                                        min_value=0.0, max_value=20.0, value=5.5)
+            
+            st.subheader("Répartition par âge")
+            moins_30 = st.number_input("Effectifs < 30 ans (%)", 
+                                      min_value=0.0, max_value=100.0, value=15.0)
+            entre_30_50 = st.number_input("Effectifs 30-50 ans (%)", 
+                                         min_value=0.0, max_value=100.0, value=45.0)
+            plus_50 = st.number_input("Effectifs > 50 ans (%)", 
+                                    min_value=0.0, max_value=100.0, value=40.0)
+            
+            # Vérifier que la somme des pourcentages est égale à 100%
+            sum_age = moins_30 + entre_30_50 + plus_50
+            if abs(sum_age - 100) > 0.01:  # Tolérance de 0.01%
+                st.warning(f"La somme des pourcentages par âge doit être égale à 100% (actuellement {sum_age:.2f}%)")
+            
+            # Calculer l'équilibre des âges
+            indicateurs["equilibre_age"] = float(calculer_equilibre_age((moins_30, entre_30_50, plus_50)))
+            
+            st.subheader("Climat social")
+            indicateurs["taux_absenteisme"] = st.number_input("Taux d'absentéisme (%)", 
+                                                            min_value=0.0, max_value=20.0, value=4.2)
+            
+        evaluer = st.form_submit_button("Évaluer", type="primary")
+
+elif methode == "Téléchargement de fichier CSV/Excel":
+    # Template de fichier à télécharger
+    st.subheader("Téléchargez un modèle de fichier")
+    
+    # Modèles CSV et Excel (générés une seule fois, voir construire_modeles)
+    csv_modele, excel_modele = construire_modeles()
+    
+    # Boutons de téléchargement des modèles
+    st.download_button(
+        label="Télécharger le modèle CSV",
+        data=csv_modele,
+        file_name="modele_indicateurs_di.csv",
+        mime="text/csv"
+    )
+    st.download_button(
+        label="Télécharger le modèle Excel",
+        data=excel_modele,
+        file_name="modele_indicateurs_di.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+    
+    # Téléchargement du fichier par l'utilisateur
+    st.subheader("Importez votre fichier CSV ou Excel")
+    uploaded_file = st.file_uploader("Choisir un fichier", type=['csv', 'xlsx', 'xls'])
+    
+    if uploaded_file is not None:
+        # Déterminer le type de fichier et le lire
+        try:
+            if uploaded_file.name.endswith('.csv'):
+                data = pd.read_csv(uploaded_file, engine=CSV_ENGINE)
+            else:  # Excel
+                data = pd.read_excel(uploaded_file, engine=EXCEL_ENGINE)
+            
+            # Vérifier le format du fichier
+            expected_columns = set(["Indicateur", "Valeur"])
+            if not expected_columns.issubset(set(data.columns)):
+                st.error("Le fichier doit contenir les colonnes 'Indicateur' et 'Valeur'")
+            else:
+                # Convertir en dictionnaire
+                data_dict = dict(zip(data['Indicateur'], data['Valeur']))
+                
+                # Extraire les informations
+                nom_entreprise = data_dict.get('nom_entreprise', "Entreprise inconnue")
+                annee = int(data_dict.get('annee', 2022))
+                
+                # Remplir les indicateurs
+                indicateurs["taux_feminisation"] = float(data_dict.get('taux_feminisation', 0))
+                indicateurs["taux_femmes_cadres"] = float(data_dict.get('taux_femmes_cadres', 0))
+                indicateurs["ecart_salaire"] = float(data_dict.get('ecart_salaire', 0))
+                indicateurs["taux_handicap"] = float(data_dict.get('taux_handicap', 0))
+                
+                # Calculer l'équilibre des âges
+                moins_30 = float(data_dict.get('moins_30_ans', 0))
+                entre_30_50 = float(data_dict.get('entre_30_50_ans', 0))
+                plus_50 = float(data_dict.get('plus_50_ans', 0))
+                
+                # Vérifier que la somme des pourcentages est égale à 100%
+                sum_age = moins_30 + entre_30_50 + plus_50
+                if abs(sum_age - 100) > 0.01:  # Tolérance de 0.01%
+                    st.warning(f"La somme des pourcentages par âge doit être égale à 100% (actuellement {sum_age:.2f}%)")
+                
+                indicateurs["equilibre_age"] = float(calculer_equilibre_age((moins_30, entre_30_50, plus_50)))
+                indicateurs["taux_absenteisme"] = float(data_dict.get('taux_absenteisme', 0))
+                
+                st.success("Données importées avec succès!")
+                
+                # Afficher les données importées
+                st.subheader("Données importées")
+                st.write(f"**Entreprise:** {nom_entreprise}")
+                st.write(f"**Année:** {annee}")
+                
+                for key, value in indicateurs.items():
+                    st.write(f"**{key}:** {value}")
+                
+        except Exception as e:
+            st.error(f"Erreur lors de la lecture du fichier: {e}")
+
+# Définir des couleurs pour chaque note
+COULEURS_NOTES = {
+    "A": "#4CAF50",  # Vert
+    "B": "#8BC34A",  # Vert clair
+    "C": "#FFC107",  # Jaune
+    "D": "#FF9800",  # Orange
+    "E": "#F44336"   # Rouge
+}
+
+# Recommandations pour les indicateurs à améliorer en priorité (notes D et E)
+RECOS = {
+    "Taux de féminisation global": "Mettre en place des actions pour augmenter le recrutement de femmes, notamment dans les métiers techniques",
+    "Taux de femmes cadres": "Développer des programmes de mentorat et de promotion des femmes vers les postes de cadres",
+    "Taux d'emploi handicap": "Renforcer la politique de recrutement et d'aménagement des postes pour atteindre le seuil légal de 6%",
+    "Écart de salaire H/F": "Mettre en place une revue systématique des rémunérations et un plan de rattrapage salarial",
+    "Équilibre des âges": "Diversifier les recrutements pour équilibrer la pyramide des âges et favoriser le transfert de compétences",
+    "Taux d'absentéisme": "Analyser les causes profondes et mettre en place des actions d'amélioration de la qualité de vie au travail"
+}
+
+# Figures Plotly mises en cache : clés = petits tuples de résultats, reconstruites seulement s'ils changent
+@st.cache_resource(show_spinner=False)
+def figure_jauge(score_global, note_globale):
+    # Créer un indicateur visuel pour la note globale
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=score_global,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': f"Score Global: {note_globale}", 'font': {'size': 24}},
+        gauge={
+            'axis': {'range': [0, 5], 'tickwidth': 1, 'tickcolor': "darkblue"},
+            'bar': {'color': COULEURS_NOTES.get(note_globale, "#888888")},
+            'steps': [
+                {'range': [0, 1.5], 'color': "#F44336"},
+                {'range': [1.5, 2.5], 'color': "#FF9800"},
+                {'range': [2.5, 3.5], 'color': "#FFC107"},
+                {'range': [3.5, 4.5], 'color': "#8BC34A"},
+                {'range': [4.5, 5], 'color': "#4CAF50"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': score_global
+            }
+        }
+    ))
+
+    fig.update_layout(
+        height=300,
+        margin=dict(l=20, r=20, t=50, b=20),
+    )
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def figure_radar(categories, scores):
+    # Créer un graphique radar pour visualiser les scores par dimension
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatterpolar(
+        r=list(scores),
+        theta=categories,
+        fill='toself',
+        name='Scores par dimension',
+        line_color='rgba(32, 128, 255, 0.8)',
+        fillcolor='rgba(32, 128, 255, 0.3)'
+    ))
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 5]
+            )
+        ),
+        showlegend=False,
+        height=300,
+        margin=dict(l=70, r=70, t=20, b=20),
+    )
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def figure_barres(indicateurs_tries, scores_tries, notes_tries):
+    df_sorted = pd.DataFrame({"Indicateur": indicateurs_tries, "Score": scores_tries, "Note": notes_tries})
+    
+    # Créer un graphique à barres avec Plotly
+    fig = px.bar(
+        df_sorted,
+        x="Indicateur",
+        y="Score",
+        color="Note",
+        color_discrete_map=COULEURS_NOTES,
+        text="Note",
+        labels={"Score": "Score (1-5)", "Indicateur": ""},
+        height=400
+    )
+
+    fig.update_layout(
+        xaxis_tickangle=-45,
+        yaxis=dict(range=[0, 5.5]),
+        margin=dict(l=20, r=20, t=20, b=80),
+    )
+
+    fig.update_traces(textposition='outside')
+    return fig
+
+# Rapport Excel des résultats (mis en cache : reconstruit seulement si les résultats changent)
+@st.cache_data(show_spinner=False)
+def construire_rapport_excel(df_resultats, nom_entreprise, annee, note_globale, score_global, date_evaluation):
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
+        # Feuille des résultats
+        df_resultats.to_excel(writer, sheet_name='Résultats', index=False)
+        workbook = writer.book
+        worksheet = writer.sheets['Résultats']
+        
+        # Formats pour les cellules
+        header_format = workbook.add_format({
+            'bold': True,
+            'bg_color': '#007BFF',
+            'color': 'white',
+            'align': 'center',
+            'valign': 'vcenter',
+            'border': 1
+        })
+        
+        # Appliquer le format d'en-tête
+        worksheet.write_row(0, 0, df_resultats.columns, header_format)
+        
+        # Ajuster la largeur des colonnes (longueur maximale de chaque colonne, en-tête compris)
+        largeurs = df_resultats.astype(str).apply(lambda col: col.str.len().max())
+        for i, (col, largeur) in enumerate(largeurs.items()):
+            worksheet.set_column(i, i, max(largeur, len(col)) + 2)
+        
+        # Ajouter une feuille pour les informations générales
+        info_data = {
+            'Information': [
+                'Entreprise',
+                'Année',
+                'Note globale',
+                'Score global',
+                'Date d\'évaluation'
+            ],
+            'Valeur': [
+                nom_entreprise,
+                annee,
+                note_globale,
+                f"{score_global:.2f}/5",
+                date_evaluation
+            ]
+        }
+        pd.DataFrame(info_data).to_excel(writer, sheet_name='Informations', index=False)
+    
+    return buffer.getvalue()
+
+# Bouton pour lancer l'évaluation (en saisie manuelle, c'est le bouton du formulaire)
+if methode != "Saisie manuelle":
+    evaluer = st.button("Évaluer", type="primary")
+
+# Clé des données saisies : l'évaluation n'est recalculée que si elle change
+cle_evaluation = hash((nom_entreprise, annee, tuple(sorted(indicateurs.items())))) if indicateurs else None
+
+if evaluer and indicateurs and st.session_state.get("cle_evaluation") != cle_evaluation:
+    # Horodatage unique de l'évaluation (feuille d'informations et noms de fichiers)
+    eval_ts = datetime.now()
+    
+    # Calculer les notes et les scores numériques de tous les indicateurs
+    notes, scores = noter_indicateurs(indicateurs)
+    resultats = dict(zip(LIBELLES_NOTES, notes.tolist()))
+    notes_numeriques = dict(zip(LIBELLES_NOTES, scores.tolist()))
+    
+    # Calculer le score global
+    score_global = float(scores.mean())
+    note_globale = chiffre_vers_note(score_global)
+    
+    # Préparation des données pour l'affichage
+    df_resultats = pd.DataFrame({
+        "Indicateur": list(resultats.keys()),
+        # Note catégorielle ordonnée (A meilleure que E) : comparaisons sur les codes entiers
+        "Note": pd.Categorical(notes, categories=list("ABCDE"), ordered=True),
+        "Score": list(notes_numeriques.values()),
+        "Valeur": [
+            f"{indicateurs['taux_feminisation']:.1f}%",
+            f"{indicateurs['taux_femmes_cadres']:.1f}%",
+            f"{indicateurs['taux_handicap']:.1f}%",
+            f"{indicateurs['ecart_salaire']:.1f}%",
+            f"{indicateurs['equilibre_age']:.1f}%",
+            f"{indicateurs['taux_absenteisme']:.1f}%"
+        ]
+    })
+    
+    # Ajouter une colonne de couleurs
+    df_resultats["Couleur"] = df_resultats["Note"].map(COULEURS_NOTES)
+    
+    st.session_state.update(
+        cle_evaluation=cle_evaluation,
+        evaluation=(eval_ts, resultats, notes_numeriques, score_global, note_globale, df_resultats)
+    )
+
+# Affichage des résultats de l'évaluation enregistrée (regroupé dans une fonction)
+def afficher_resultats(nom_entreprise, annee):
+    """
+    Affiche les graphiques, le détail des notes, l'analyse et les téléchargements de l'évaluation.
+    
+    Args:
+        nom_entreprise: Nom de l'entreprise évaluée
+        annee: Année des données évaluées
+    """
+    st.markdown("## 📊 Résultats de l'évaluation")
+    
+    eval_ts, resultats, notes_numeriques, score_global, note_globale, df_resultats = st.session_state["evaluation"]
+    
+    # Afficher le score global
+    col1, col2 = st.columns([1, 3])
+    
+    with col1:
+        # Indicateur visuel pour la note globale
+        st.plotly_chart(figure_jauge(score_global, note_globale), use_container_width=True)
+    
+    with col2:
+        # Graphique radar pour visualiser les scores par dimension
+        st.plotly_chart(
+            figure_radar(tuple(df_resultats["Indicateur"]), tuple(df_resultats["Score"])),
+            use_container_width=True
+        )
+    
+    # Afficher le tableau des résultats détaillés
+    st.subheader("Détail des notes par indicateur")
+    
+    # Créer une fonction de mise en forme pour les cellules de la colonne Note
+    def color_note(note):
+        return f'background-color: {COULEURS_NOTES.get(note, "#888888")}; color: white; font-weight: bold'
+    
+    # Afficher le DataFrame avec mise en forme
+    st.dataframe(
+        df_resultats[["Indicateur", "Valeur", "Note", "Score"]].style.map(color_note, subset=["Note"]),
+        use_container_width=True,
+        hide_index=True
+    )
+    
+    # Graphique à barres des scores par indicateur
+    st.subheader("Comparaison des scores par indicateur")
+    
+    # Trier le DataFrame par score, du plus élevé au plus bas
+    df_sorted = df_resultats.sort_values("Score", ascending=False)
+    st.plotly_chart(
+        figure_barres(tuple(df_sorted["Indicateur"]), tuple(df_sorted["Score"]), tuple(df_sorted["Note"])),
+        use_container_width=True
+    )
+    
+    # Résumé et recommandations
+    st.markdown("## 📝 Analyse et recommandations")
+    
+    # Identifier les points forts (notes A et B)
+    points_forts = df_resultats[df_resultats["Note"] <= "B"]["Indicateur"].tolist()
+    
+    # Identifier les points à améliorer (notes D et E)
+    points_amelioration = df_resultats[df_resultats["Note"] >= "D"]["Indicateur"].tolist()
+    
+    # Générer les recommandations (un seul bloc Markdown par section)
+    if len(points_forts) > 0:
+        st.markdown("### Points forts\n\n" + "\n\n".join(
+            f"✅ **{point}**: Performance solide, à maintenir" for point in points_forts
+        ))
+    
+    if len(points_amelioration) > 0:
+        st.markdown("### Points à améliorer en priorité\n\n" + "\n\n".join(
+            f"🔍 **{point}**: {RECOS[point]}" for point in points_amelioration
+        ))
+    
+    # Points intermédiaires (note C)
+    points_intermediaires = df_resultats[df_resultats["Note"] == "C"]["Indicateur"].tolist()
+    if len(points_intermediaires) > 0:
+        st.markdown("### Points à consolider\n\n" + "\n\n".join(
+            f"🔄 **{point}**: Performance moyenne, des progrès sont encore possibles" for point in points_intermediaires
+        ))
+    
+    # Conclusion générale
+    st.markdown("### Conclusion générale")
+    if note_globale in ["A", "B"]:
+        st.markdown(f"""
+        **Avec une note globale de {note_globale} (score {score_global:.2f}/5)**, l'entreprise démontre un engagement solide en matière de diversité et d'inclusion.
+        Les bonnes pratiques en place méritent d'être valorisées et partagées.
+        """)
+    elif note_globale == "C":
+        st.markdown(f"""
+        **Avec une note globale de {note_globale} (score {score_global:.2f}/5)**, l'entreprise présente des résultats mitigés en matière de diversité et d'inclusion.
+        Des progrès significatifs sont encore nécessaires pour atteindre l'excellence dans ce domaine.
+        """)
+    else:
+        st.markdown(f"""
+        **Avec une note globale de {note_globale} (score {score_global:.2f}/5)**, l'entreprise présente des performances insuffisantes en matière de diversité et d'inclusion.
+        Un plan d'action ambitieux et global est nécessaire pour améliorer ces résultats.
+        """)
+    
+    # Référence aux objectifs de développement durable
+    st.markdown("### Lien avec les Objectifs de Développement Durable (ODD)")
+    st.markdown("""
+    Cette évaluation s'inscrit dans le cadre des Objectifs de Développement Durable des Nations Unies, en particulier :
+    - **ODD 5** : Égalité entre les sexes
+    - **ODD 8** : Travail décent et croissance économique
+    - **ODD 10** : Réduction des inégalités
+    """)
+    
+    # Possibilité de télécharger le rapport
+    st.markdown("## 📥 Téléchargement du rapport")
+    
+    # Préparation du rapport au format CSV
+    rapport_csv = df_resultats.to_csv(index=False)
+    st.download_button(
+        label="Télécharger le rapport (CSV)",
+        data=rapport_csv,
+        file_name=f"rapport_di_{nom_entreprise}_{annee}_{eval_ts:%Y%m%d}.csv",
+        mime="text/csv",
+    )
+    
+    # Préparation du rapport au format Excel (mis en cache sur les résultats affichés)
+    excel_data = construire_rapport_excel(
+        df_resultats, nom_entreprise, annee, note_globale, score_global,
+        eval_ts.strftime("%d/%m/%Y")
+    )
+    st.download_button(
+        label="Télécharger le rapport (Excel)",
+        data=excel_data,
+        file_name=f"rapport_di_{nom_entreprise}_{annee}_{eval_ts:%Y%m%d}.xlsx",
+        mime="application/vnd.ms-excel",
+    )
+    
+# Afficher les résultats tant que les données évaluées n'ont pas changé
+if indicateurs and st.session_state.get("cle_evaluation") == cle_evaluation:
+    afficher_resultats(nom_entreprise, annee)
+    
+    # Ajouter un exemple de données EDF basé sur le document fourni
+    st.markdown("## 🔍 Exemple : Données EDF 2022")
+    st.markdown("""
+    Selon le bilan social d'EDF SA pour 2022, les indicateurs clés sont les suivants :
+    - **Taux de féminisation** : 30%
+    - **Taux de femmes cadres** : 28%
+    - **Taux d'emploi des personnes en situation de handicap** : en progression, mais encore sous le seuil légal
+    - **Écart de salaire hommes/femmes** : des progrès notables mais des écarts persistent
+    - **Répartition par âge** : âge moyen de 42,5 ans, avec une concentration importante dans les tranches supérieures
+    - **Taux d'absentéisme** : légèrement au-dessus de la moyenne du secteur
+    
+    EDF s'est fixé des objectifs ambitieux pour 2025 (33% de femmes à tous les niveaux) et 2030 (36 à 40% de femmes),
+    avec un plan d'action pour féminiser notamment les métiers techniques et SI.
+    """)
+
+# Pied de page
+st.markdown("---")
+st.markdown("""
+**Diversité & Inclusion Analytics** | Développé avec Streamlit | Basé sur les référentiels du secteur énergie/industrie
+""")
+
+# Ajout d'informations sur la méthodologie dans la barre latérale
+with st.sidebar:
+    st.header("À propos")
+    st.markdown("""
+    Cet outil d'évaluation est basé sur les pratiques et standards du secteur énergie/industrie.
+    Les seuils utilisés pour l'évaluation sont définis à partir de benchmarks sectoriels
+    et des exigences légales en vigueur.
+    
+    **Sources**:
+    - Bilans sociaux des entreprises du CAC40
+    - Rapports de performance extra-financière
+    - Études sectorielles
+    - Cadre légal (notamment la loi Copé-Zimmermann, loi Avenir professionnel)
+    
+    **Développé par**: Japhet Calixte N'DRI
+    """)
+    
+    # Affichage des références
+    st.header("Références")
+    st.markdown("""
+    - Bruna, M. G. (2011). Diversité dans l'entreprise : d'impératif éthique à levier de créativité.
+    - Arreola, F., & Sachet Milliat, A. (2022). Question(s) de diversité et inclusion dans l'emploi : nouvelles perspectives.
+    - Thomas, D. A., & Ely, R. J. (1996). Making differences matter: A new paradigm for managing diversity.
+    """)
+    
+    # Ajouter le logo EDF
+    st.markdown("### Étude de cas: D&I en entreprise ")
+
+# Image d'illustration : URL directe de l'image (et non la page de résultats Bing), téléchargée
+# au plus une fois par jour au lieu d'être récupérée par le navigateur à chaque exécution
+IMAGE_ETUDE_DE_CAS = "https://groupemenway.com/wp-content/uploads/2023/02/modern-companies-encourage-cultural-diversity-in-t-2022-02-22-14-06-52-utc-scaled.jpg"
+
+# L'échec est aussi mis en cache (None) : un serveur injoignable ne bloque pas chaque exécution
+@st.cache_data(ttl=86400, show_spinner=False)
+def charger_image(url):
+    try:
+        with urllib.request.urlopen(url, timeout=5) as reponse:
+            return reponse.read()
+    except OSError:
+        return None
+
+image_etude_de_cas = charger_image(IMAGE_ETUDE_DE_CAS)
+if image_etude_de_cas:
+    st.image(image_etude_de_cas, width=150)
+
+# Correspondance libellé -> clé des indicateurs, et seuils par défaut d'un indicateur inconnu
+MAPPING_INDICATEURS = dict(zip(LIBELLES_NOTES, CLES_NOTES))
+SEUILS_PAR_DEFAUT = (0, 0, 0, 0)
+
+# Données du PDF mises en cache : fonction pure de ses arguments
+@st.cache_data(show_spinner=False)
+def prepare_data_for_pdf(resultats, points_forts, axes_amelioration, note_globale, score_global, indicateurs):
+    """
+    Prépare les données pour la génération du PDF.
+    """
+    try:
+        return {
+            "resultats": {
+                k: {
+                    "note": v,
+                    "valeur": float(indicateurs.get(cle := MAPPING_INDICATEURS[k], 0)),
+                    "seuils": seuils.get(cle, SEUILS_PAR_DEFAUT)
+                } for k, v in resultats.items()
+            },
+            "points_forts": points_forts if points_forts else [],
+            "axes_amelioration": axes_amelioration if axes_amelioration else [],
+            "note_globale": note_globale,
+            "score_global": float(score_global)
+        }
+    except Exception as e:
+        raise Exception(f"Erreur lors de la préparation des données : {str(e)}")
+
+# Styles du rapport PDF, créés une seule fois par processus (ReportLab importé à la première génération)
+@st.cache_resource(show_spinner=False)
+def charger_styles_pdf():
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+
+    styles = getSampleStyleSheet()
+    bleu = colors.HexColor("#1E3A8A")
+    return {
+        "titre": ParagraphStyle("TitreRapport", parent=styles["Title"], textColor=bleu),
+        "sous_titre": ParagraphStyle("SousTitreRapport", parent=styles["Heading2"], alignment=TA_CENTER, textColor=bleu),
+        "section": ParagraphStyle("SectionRapport", parent=styles["Heading3"], textColor=bleu, spaceBefore=12),
+        "texte": ParagraphStyle("TexteRapport", parent=styles["Normal"], leading=14),
+        "cellule": ParagraphStyle("CelluleRapport", parent=styles["Normal"], fontSize=9, leading=11),
+        "analyse": ParagraphStyle("AnalyseRapport", parent=styles["Normal"], fontName="Helvetica-Oblique", fontSize=9, leading=11),
+        "puce": ParagraphStyle("PuceRapport", parent=styles["Normal"], leftIndent=12, leading=14, spaceBefore=3),
+        "badge": ParagraphStyle("BadgeRapport", parent=styles["Normal"], fontName="Helvetica-Bold", fontSize=32,
+                                leading=36, alignment=TA_CENTER, textColor=colors.white),
+        "pied": ParagraphStyle("PiedRapport", parent=styles["Normal"], fontSize=8, alignment=TA_CENTER, textColor=colors.HexColor("#666666"))
+    }
+
+# PDF mis en cache : les mêmes données, le même jour, redonnent le PDF déjà produit
+@st.cache_data(show_spinner=False, max_entries=32)
+def construire_pdf(data, company_name, year, date_generation):
+    """
+    Construit le PDF du rapport avec ReportLab (mise en page fixe dessinée directement, sans HTML).
+    
+    Args:
+        data: Données préparées par prepare_data_for_pdf
+        company_name: Nom de l'entreprise
+        year: Année des données
+        date_generation: Date (jour) affichée en pied de rapport, partie de la clé du cache
+    
+    Returns:
+        Le contenu du PDF
+    """
+    from xml.sax.saxutils import escape
+    from reportlab.graphics.shapes import Drawing, Rect
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    styles = charger_styles_pdf()
+    bleu, fond, bordure = colors.HexColor("#1E3A8A"), colors.HexColor("#f8f9fa"), colors.HexColor("#dddddd")
+    
+    # Liaisons locales des fonctions appelées à chaque ligne des compréhensions
+    _analyse, _lignes_recos, _float, _round = get_analyse_indicateur, RECOMMANDATIONS_LIGNES.get, float, round
+    
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer, pagesize=A4, title=f"Rapport D&I - {company_name}",
+        leftMargin=20 * mm, rightMargin=20 * mm, topMargin=20 * mm, bottomMargin=20 * mm
+    )
+    largeur = doc.width
+    note_globale = data['note_globale']
+    score_global = _round(_float(data['score_global']), 2)
+    hex_globale = COULEURS_NOTES.get(note_globale, "#333333")
+    
+    # En-tête et score global (les Paragraph interprètent un balisage XML : les textes sont échappés)
+    badge = Table([[Paragraph(note_globale, styles["badge"])]], colWidths=[25 * mm], rowHeights=[25 * mm])
+    badge.setStyle(TableStyle([
+        ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor(hex_globale)),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE")
+    ]))
+    progression = Drawing(largeur, 10)
+    progression.add(Rect(0, 0, largeur, 10, fillColor=colors.HexColor("#f0f0f0"), strokeColor=None))
+    progression.add(Rect(0, 0, largeur * score_global / 5, 10, fillColor=bleu, strokeColor=None))
+    
+    story = [
+        Paragraph("Rapport d'Évaluation Diversité &amp; Inclusion", styles["titre"]),
+        Paragraph(escape(f"{company_name} - {year}"), styles["sous_titre"]),
+        Spacer(1, 12),
+        Paragraph("Score Global", styles["section"]),
+        Paragraph(f"Score : {score_global}/5", styles["texte"]),
+        Paragraph(f'Note : <font color="{hex_globale}"><b>{note_globale}</b></font>', styles["texte"]),
+        Spacer(1, 12),
+        badge,
+        Spacer(1, 12),
+        progression,
+        Paragraph("Résultats Détaillés", styles["section"])
+    ]
+    
+    # Tableau des résultats : une ligne par indicateur, note colorée
+    lignes = [["Indicateur", "Valeur Réelle", "Note", "Analyse"]] + [
+        [
+            Paragraph(escape(k), styles["cellule"]),
+            f"{_round(_float(v['valeur']), 1)}%",
+            v['note'],
+            Paragraph(escape(_analyse(k, v['valeur'], v['note'])), styles["analyse"])
+        ]
+        for k, v in data['resultats'].items()
+    ]
+    tableau = Table(lignes, colWidths=[largeur * 0.25, largeur * 0.15, largeur * 0.1, largeur * 0.5], repeatRows=1)
+    tableau.setStyle(TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), bleu),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, fond]),
+        ("GRID", (0, 0), (-1, -1), 0.5, bordure),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("ALIGN", (1, 1), (2, -1), "CENTER"),
+        ("FONTNAME", (1, 1), (2, -1), "Helvetica-Bold")
+    ] + [
+        ("TEXTCOLOR", (2, i), (2, i), colors.HexColor(COULEURS_NOTES.get(v['note'], "#333333")))
+        for i, v in enumerate(data['resultats'].values(), start=1)
+    ]))
+    story.append(tableau)
+    
+    # Listes à puces : points forts, axes d'amélioration et recommandations (notes D et E)
+    recommandations = [
+        reco.lstrip("• ") for indicateur, note in data['resultats'].items()
+        if note['note'] in ['D', 'E']
+        for reco in _lignes_recos((indicateur, note['note']), [])
+    ]
+    for titre, elements in (
+        ("Points Forts", data['points_forts']),
+        ("Axes d'Amélioration", data['axes_amelioration']),
+        ("Recommandations", recommandations)
+    ):
+        if elements:
+            story.append(Paragraph(titre, styles["section"]))
+            story.extend(Paragraph(escape(element), styles["puce"], bulletText="•") for element in elements)
+    
+    # Conclusion et pied de page
+    story += [
+        Paragraph("Conclusion", styles["section"]),
+        Paragraph(escape(f"{company_name} {get_conclusion_phrase(note_globale)}"), styles["texte"]),
+        Spacer(1, 24),
+        Paragraph(f"Rapport généré le {date_generation}", styles["pied"]),
+        Paragraph("© 2024 Diversité &amp; Inclusion Analytics", styles["pied"])
+    ]
+    
+    doc.build(story)
+    return buffer.getvalue()
+
+def generate_pdf(data, company_name, year):
+    """
+    Génère un rapport PDF avec les résultats de l'évaluation (ReportLab).
+    """
+    try:
+        return construire_pdf(data, company_name, year, time.strftime('%d/%m/%Y'))
+    except Exception as e:
+        st.error(f"Erreur lors de la génération du PDF : {str(e)}")
+        return None
+
+# Analyses du rapport PDF par indicateur et par note (modèles complétés avec la valeur de l'indicateur)
+ANALYSES_PDF = {
+    "Taux de féminisation global": {
+        "A": "Avec {valeur}% de femmes, l'entreprise montre une excellente parité.",
+        "B": "Avec {valeur}% de femmes, l'entreprise est proche de la parité.",
+        "C": "Avec {valeur}% de femmes, l'entreprise a une mixité moyenne.",
+        "D": "Avec {valeur}% de femmes, l'entreprise doit améliorer sa mixité.",
+        "E": "Avec {valeur}% de femmes, l'entreprise présente un déséquilibre important."
+    },
+    "Taux de femmes cadres": {
+        "A": "Avec {valeur}% de femmes cadres, l'entreprise montre une excellente représentation des femmes aux postes de direction.",
+        "B": "Avec {valeur}% de femmes cadres, l'entreprise a une bonne représentation des femmes aux postes de direction.",
+        "C": "Avec {valeur}% de femmes cadres, l'entreprise a une représentation moyenne des femmes aux postes de direction.",
+        "D": "Avec {valeur}% de femmes cadres, l'entreprise doit améliorer la représentation des femmes aux postes de direction.",
+        "E": "Avec {valeur}% de femmes cadres, l'entreprise présente un déséquilibre important dans les postes de direction."
+    },
+    "Taux d'emploi handicap": {
+        "A": "Avec {valeur}% de personnes en situation de handicap, l'entreprise dépasse largement le seuil légal de 6%.",
+        "B": "Avec {valeur}% de personnes en situation de handicap, l'entreprise respecte bien le seuil légal de 6%.",
+        "C": "Avec {valeur}% de personnes en situation de handicap, l'entreprise est proche du seuil légal de 6%.",
+        "D": "Avec {valeur}% de personnes en situation de handicap, l'entreprise est en dessous du seuil légal de 6%.",
+        "E": "Avec {valeur}% de personnes en situation de handicap, l'entreprise est très en dessous du seuil légal de 6%."
+    },
+    "Écart de salaire H/F": {
+        "A": "Avec un écart de {valeur}%, l'entreprise montre une excellente équité salariale.",
+        "B": "Avec un écart de {valeur}%, l'entreprise montre une bonne équité salariale.",
+        "C": "Avec un écart de {valeur}%, l'entreprise a une équité salariale moyenne.",
+        "D": "Avec un écart de {valeur}%, l'entreprise doit améliorer son équité salariale.",
+        "E": "Avec un écart de {valeur}%, l'entreprise présente un écart salarial important."
+    },
+    "Équilibre des âges": {
+        "A": "Avec un score d'équilibre de {valeur}%, l'entreprise montre une excellente diversité des âges.",
+        "B": "Avec un score d'équilibre de {valeur}%, l'entreprise montre une bonne diversité des âges.",
+        "C": "Avec un score d'équilibre de {valeur}%, l'entreprise a une diversité des âges moyenne.",
+        "D": "Avec un score d'équilibre de {valeur}%, l'entreprise doit améliorer sa diversité des âges.",
+        "E": "Avec un score d'équilibre de {valeur}%, l'entreprise présente un déséquilibre important des âges."
+    },
+    "Taux d'absentéisme": {
+        "A": "Avec un taux d'absentéisme de {valeur}%, l'entreprise montre une excellente gestion de la santé au travail.",
+        "B": "Avec un taux d'absentéisme de {valeur}%, l'entreprise montre une bonne gestion de la santé au travail.",
+        "C": "Avec un taux d'absentéisme de {valeur}%, l'entreprise a une gestion moyenne de la santé au travail.",
+        "D": "Avec un taux d'absentéisme de {valeur}%, l'entreprise doit améliorer sa gestion de la santé au travail.",
+        "E": "Avec un taux d'absentéisme de {valeur}%, l'entreprise présente des problèmes importants de santé au travail."
+    }
+}
+
+# Recommandations du rapport PDF par indicateur, pour les notes D et E
+RECOMMANDATIONS_PDF = {
+    "Taux de féminisation global": {
+        "D": """• Mettre en place un plan de recrutement ciblé pour les femmes
+• Développer des partenariats avec des écoles/universités pour attirer les talents féminins
+• Créer un programme de mentorat pour les femmes
+• Communiquer sur les opportunités de carrière pour les femmes""",
+        "E": """• Établir un plan d'action urgent pour la féminisation
+• Fixer des objectifs chiffrés de recrutement de femmes
+• Former les recruteurs à la lutte contre les biais
+• Mettre en place un réseau de femmes dans l'entreprise"""
+    },
+    "Taux de femmes cadres": {
+        "D": """• Identifier les femmes à fort potentiel
+• Créer un programme de développement de carrière
+• Mettre en place un système de parrainage
+• Former les managers à la détection des talents""",
+        "E": """• Réviser les processus de promotion
+• Créer un programme accéléré de développement des talents féminins
+• Mettre en place un comité de suivi de la parité
+• Établir des objectifs de progression annuels"""
+    },
+    "Taux d'emploi handicap": {
+        "D": """• Renforcer les partenariats avec les organismes spécialisés
+• Former les managers à l'accueil des personnes en situation de handicap
+• Adapter les postes de travail
+• Sensibiliser les équipes""",
+        "E": """• Élaborer un plan d'action urgent pour atteindre le seuil légal
+• Créer un poste dédié à l'inclusion des personnes en situation de handicap
+• Mettre en place un réseau d'ambassadeurs
+• Réviser les processus de recrutement"""
+    },
+    "Écart de salaire H/F": {
+        "D": """• Réaliser un audit complet des rémunérations
+• Mettre en place un plan de rattrapage progressif
+• Former les managers à l'équité salariale
+• Établir des grilles de salaire transparentes""",
+        "E": """• Corriger immédiatement les écarts injustifiés
+• Mettre en place un système de contrôle régulier
+• Créer un comité de suivi des rémunérations
+• Publier les indicateurs d'écart de rémunération"""
+    },
+    "Équilibre des âges": {
+        "D": """• Développer des programmes de transfert de compétences
+• Mettre en place un système de tutorat intergénérationnel
+• Adapter les conditions de travail pour tous les âges
+• Promouvoir la diversité des âges dans la communication""",
+        "E": """• Élaborer un plan de renouvellement des effectifs
+• Créer des programmes de reconversion
+• Mettre en place un système de préparation à la retraite
+• Développer des parcours de carrière adaptés"""
+    },
+    "Taux d'absentéisme": {
+        "D": """• Analyser les causes de l'absentéisme
+• Mettre en place des actions de prévention
+• Améliorer les conditions de travail
+• Développer le télétravail""",
+        "E": """• Réaliser un audit complet des conditions de travail
+• Mettre en place un plan d'action immédiat
+• Renforcer le suivi médical
+• Créer un groupe de travail dédié"""
+    }
+}
+
+# Recommandations découpées en lignes une seule fois : {(indicateur, note): [lignes non vides]}
+RECOMMANDATIONS_LIGNES = {
+    (indicateur, note): [ligne for ligne in texte.split('\n') if ligne.strip()]
+    for indicateur, textes in RECOMMANDATIONS_PDF.items()
+    for note, texte in textes.items()
+}
+
+def get_analyse_indicateur(indicateur, valeur, note):
+    """
+    Génère une analyse détaillée pour chaque indicateur.
+    """
+    if valeur == 0:
+        return "Données non disponibles pour cet indicateur."
+    
+    return ANALYSES_PDF.get(indicateur, {}).get(note, "Analyse non disponible.").format(valeur=valeur)
+
+def get_conclusion_phrase(note):
+    conclusions = {
+        "A": "démontre une excellence en matière de diversité et d'inclusion.",
+        "B": "présente de bonnes pratiques en matière de diversité et d'inclusion.",
+        "C": "a des résultats moyens en matière de diversité et d'inclusion.",
+        "D": "nécessite des améliorations significatives en matière de diversité et d'inclusion.",
+        "E": "doit mettre en place un plan d'action urgent pour améliorer la diversité et l'inclusion."
+    }
+    return conclusions.get(note, "présente des résultats à analyser en matière de diversité et d'inclusion.")
+
+# Points forts/faibles et données du PDF, à partir de l'évaluation enregistrée (mêmes notes que l'affichage)
+def compute_report(resultats, note_globale, score_global, indicateurs):
+    """
+    Prépare les résultats de l'évaluation nécessaires au rapport PDF.
+    
+    Args:
+        resultats: Notes de l'évaluation enregistrée ({indicateur: note})
+        note_globale: Note globale de l'évaluation enregistrée
+        score_global: Score global de l'évaluation enregistrée
+        indicateurs: Valeurs des indicateurs évalués
+    
+    Returns:
+        Un tuple (points_forts, axes_amelioration, data)
+    """
+    # Calcul des points forts et axes d'amélioration
+    points_forts = []
+    axes_amelioration = []
+    
+    for indicateur, note in resultats.items():
+        if note in ["A", "B"]:
+            points_forts.append(f"{indicateur}: Performance solide (note {note})")
+        elif note in ["D", "E"]:
+            axes_amelioration.append(f"{indicateur}: Nécessite des améliorations (note {note})")
+    
+    # Préparation des données pour le PDF (mise en cache)
+    data = prepare_data_for_pdf(resultats, points_forts, axes_amelioration, note_globale, score_global, indicateurs)
+    
+    return points_forts, axes_amelioration, data
+
+# Section principale de génération du rapport
+st.markdown("## 📄 Génération du rapport")
+
+# Le PDF n'est construit que pour les données évaluées (bouton « Évaluer »), puis servi depuis le cache
+if 'indicateurs' in locals() and indicateurs and st.session_state.get("cle_evaluation") == cle_evaluation:
+    try:
+        # Vérification des indicateurs requis (clés de la grille de notation)
+        manquants = tuple(cle for cle in CLES_NOTES if cle not in indicateurs)
+        if manquants:
+            raise ValueError(f"Indicateur(s) manquant(s) : {', '.join(manquants)}")
+        mauvais_types = tuple(cle for cle in CLES_NOTES if not isinstance(indicateurs[cle], (int, float)))
+        if mauvais_types:
+            raise ValueError(f"Indicateur(s) non numérique(s) : {', '.join(mauvais_types)}")
+        
+        # Notes de l'évaluation enregistrée et préparation des données pour le PDF
+        _, resultats, _, score_global, note_globale, _ = st.session_state["evaluation"]
+        points_forts, axes_amelioration, data = compute_report(resultats, note_globale, score_global, indicateurs)
+        
+        # Génération du PDF (mise en cache) et bouton de téléchargement en une seule étape
+        pdf_data = generate_pdf(data, nom_entreprise, annee)
+        
+        if pdf_data:
+            st.download_button(
+                label="📥 Télécharger le rapport PDF",
+                data=pdf_data,
+                file_name=f"rapport_diversite_inclusion_{nom_entreprise}_{annee}.pdf",
+                mime="application/pdf",
+                type="primary"
+            )
+        else:
+            st.error("La génération du PDF a échoué.")
+        
+    except ValueError as ve:
+        st.error(f"Erreur de validation des données : {str(ve)}")
+        st.error("Veuillez vérifier que toutes les données sont correctement saisies.")
+    except Exception as e:
+        st.error(f"Erreur lors du traitement des données : {str(e)}")
+        st.error("Veuillez vérifier que toutes les données sont correctement saisies.")
+else:
+    st.warning("Veuillez d'abord saisir les données nécessaires et cliquer sur « Évaluer » pour générer le rapport.")
\ No newline at end of file